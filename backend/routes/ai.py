@@ -1,10 +1,11 @@
 """AI routes - Data-driven financial engine, voice parsing, and daily quotes"""
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone, date as date_module, timedelta
 from collections import defaultdict
 import calendar
+import hashlib
 import logging
 import random
 import re
@@ -40,6 +41,18 @@ class VoiceTransactionResponse(BaseModel):
     parsed_description: Optional[str] = None
 
 
+# Each item may cost an OpenAI call and the endpoint needs no login, so a batch stays small
+MAX_VOICE_BATCH_ITEMS = 20
+
+
+class VoiceTransactionBatchRequest(BaseModel):
+    items: List[VoiceTransactionRequest] = Field(..., max_length=MAX_VOICE_BATCH_ITEMS)
+
+
+class VoiceTransactionBatchResponse(BaseModel):
+    results: List[VoiceTransactionResponse]
+
+
 def get_quarter_dates(quarter: int, year: int):
     quarter_months = {1: (1, 3), 2: (4, 6), 3: (7, 9), 4: (10, 12)}
     start_month, end_month = quarter_months[quarter]
@@ -523,6 +536,16 @@ async def parse_voice_transaction(request: VoiceTransactionRequest, user_id: Opt
         return VoiceTransactionResponse(success=False, message="Could not parse transaction. Please try again.")
 
 
+@router.post("/parse-voice-transaction/batch", response_model=VoiceTransactionBatchResponse)
+async def parse_voice_transaction_batch(request: VoiceTransactionBatchRequest, user_id: Optional[str] = None):
+    """Parse several utterances in one round trip; results are aligned with the request items
+    
+    Items are parsed one after another, so a batch never has more than one OpenAI call in flight.
+    """
+    results = [await parse_voice_transaction(item, user_id) for item in request.items]
+    return VoiceTransactionBatchResponse(results=results)
+
+
 FAMOUS_QUOTES = {
     "investor_wisdom": [
         ("The stock market is a device for transferring money from the impatient to the patient.", "Warren Buffett"),
@@ -542,14 +565,25 @@ FAMOUS_QUOTES = {
 }
 
 
+def _quote_etag(quote: dict) -> str:
+    """Weak validator for a day's quote: the date plus a short hash of the text"""
+    digest = hashlib.sha1(quote["quote"].encode("utf-8")).hexdigest()[:8]
+    return f'W/"{quote["date"]}:{digest}"'
+
+
 @router.get("/quote-of-day")
-async def get_quote_of_day():
+async def get_quote_of_day(request: Request, response: Response):
     today = date_module.today().isoformat()
-    existing_quote = await db.daily_quotes.find_one({"date": today}, {"_id": 0})
-    if existing_quote:
-        return existing_quote
-    category = random.choice(list(FAMOUS_QUOTES.keys()))
-    quote_text, author = random.choice(FAMOUS_QUOTES[category])
-    new_quote = {"quote": quote_text, "author": author, "date": today, "category": category, "created_at": datetime.now(timezone.utc).isoformat()}
-    await db.daily_quotes.insert_one(new_quote)
-    return {"quote": new_quote["quote"], "author": new_quote["author"], "date": new_quote["date"], "category": new_quote["category"]}
+    quote = await db.daily_quotes.find_one({"date": today}, {"_id": 0})
+    if not quote:
+        category = random.choice(list(FAMOUS_QUOTES.keys()))
+        quote_text, author = random.choice(FAMOUS_QUOTES[category])
+        new_quote = {"quote": quote_text, "author": author, "date": today, "category": category, "created_at": datetime.now(timezone.utc).isoformat()}
+        await db.daily_quotes.insert_one(new_quote)
+        quote = {"quote": new_quote["quote"], "author": new_quote["author"], "date": new_quote["date"], "category": new_quote["category"]}
+
+    etag = _quote_etag(quote)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return quote
@@ -7,6 +7,7 @@ All routes are modularized into separate files under /routes/
 from fastapi import FastAPI, APIRouter, HTTPException
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
@@ -157,6 +158,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses for clients that send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=256)
+
 
 # ========== APP STARTUP/SHUTDOWN ==========
 
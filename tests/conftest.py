@@ -0,0 +1,679 @@
+"""
+Shared fixtures for the FinanceHub API test suite
+Session-scoped so every module reuses one connection pool and one admin login
+"""
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from filelock import FileLock
+from concurrent.futures import ThreadPoolExecutor, wait
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import random
+import socket
+import time
+from types import MappingProxyType, SimpleNamespace
+
+from tests.tokens import jwt_expiry
+
+try:
+    import vcr
+except ImportError:  # pytest-recording not installed: everything talks to the live backend
+    vcr = None
+
+try:
+    from requests_cache import CachedSession, DO_NOT_CACHE
+except ImportError:  # requests-cache not installed: every GET goes to the backend
+    CachedSession = DO_NOT_CACHE = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://vaulton-preview.preview.emergentagent.com')
+
+# Route every call into backend.server's app through Starlette's TestClient instead of the network
+IN_PROCESS = os.environ.get("TEST_IN_PROCESS") == "1"
+
+# (connect, read) seconds: a dead host fails fast, while Stripe and OpenAI-backed calls may take a while
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Failures worth one more try: transient transport errors from requests/urllib3 or httpx. Assertion
+# failures never match, so a wrong response still fails on the first run.
+RERUN_ERRORS = ["ConnectionError", "ConnectError", "Timeout", "RemoteProtocolError"]
+
+# The same failures as exception types, for fixtures that handle them instead of failing
+TRANSPORT_ERRORS = (requests.ConnectionError, requests.Timeout) + ((httpx.TransportError,) if httpx else ())
+
+# Test-only identifiers are derived from a seed and the test's node id, so a test gets the same
+# ids in whatever order it runs. The seed is drawn once per run and shared by all xdist workers
+# (through xdist's run id), so the worker running a test doesn't matter either. Setting
+# PYTEST_SEED makes them reproducible across runs (e.g. when recording cassettes).
+_RUN_ID = os.environ.get("PYTEST_XDIST_TESTRUNUID") or os.urandom(8).hex()
+_SEED = os.environ.get("PYTEST_SEED") or _RUN_ID
+
+
+def _testid_for(key):
+    rng = random.Random(f"{_SEED}|{key}")
+    return lambda prefix: f"{prefix}_{rng.getrandbits(32):08x}"
+
+
+def _account(name):
+    """`name` made unique to this run, for usernames and emails
+    
+    The backend keeps every registered user, so a rerun with the same PYTEST_SEED must not try to
+    register the same accounts again.
+    """
+    return f"{name}_{_RUN_ID[:6]}"
+
+
+# xdist worker id ("gw0", ...), or "main" without xdist
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+_testid = _testid_for(f"session-{_WORKER}")
+
+
+# Test credentials
+ADMIN_EMAIL = "admin@financehub.com"
+ADMIN_USERNAME = "admin"
+ADMIN_PASSWORD = "admin"
+TRIAL_TEST_EMAIL = f"{_account(_testid('trialtest'))}@example.com"
+TRIAL_TEST_PASSWORD = "test123"
+TRIAL_TEST_USERNAME = _account(_testid("trialuser"))
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), "cassettes")
+
+# PYTEST_HTTP_CACHE=1 keeps reference data in an SQLite file across runs (e.g. under --looponfail)
+# so the FX-backed endpoints are not re-fetched upstream; by default it lives in memory for one run
+HTTP_CACHE_ON_DISK = os.environ.get("PYTEST_HTTP_CACHE") == "1"
+HTTP_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".pytest_http_cache")
+
+# Reference data that no test mutates; anything else (envelopes, transactions, /me) must always
+# hit the backend because the tests verify their own writes through it
+CACHED_GETS = {
+    "*/api/currencies": 3600 if HTTP_CACHE_ON_DISK else 60,
+    "*/api/exchange-rates/*": 3600 if HTTP_CACHE_ON_DISK else 60,
+    "*/api/quote-of-day": 60,
+    "*": DO_NOT_CACHE
+}
+
+
+# Read-only endpoints no test depends on the ordering of; parallel_gets fetches them all at once
+PUBLIC_GETS = [
+    "/api/", "/api/quote-of-day", "/api/currencies", "/api/exchange-rates/USD"
+]
+PRIVATE_GETS = [
+    "/api/transactions", "/api/transactions/summary", "/api/analytics", "/api/analytics/budget-growth",
+    "/api/analytics/investment-growth", "/api/portfolio", "/api/recurring-transactions",
+    "/api/budget-envelopes", "/api/categories/custom"
+]
+
+
+def _new_session(adapter):
+    """requests session that sends JSON over the given (shared) pooled adapter, caching CACHED_GETS"""
+    if CachedSession:
+        session = CachedSession(
+            HTTP_CACHE_PATH,
+            backend="sqlite" if HTTP_CACHE_ON_DISK else "memory",
+            allowable_methods=("GET",),
+            urls_expire_after=CACHED_GETS
+        )
+    else:
+        session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+    # Read proxy and CA-bundle settings from the environment once here rather than on every request
+    # (trust_env also makes requests look up ~/.netrc per call); verify=True is certifi's bundle
+    session.proxies.update(requests.utils.get_environ_proxies(BASE_URL))
+    session.verify = os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or True
+    session.trust_env = False
+    return session
+
+
+def _bearer(token):
+    """Read-only Authorization header for `token`, built once and shared by every call using it"""
+    return MappingProxyType({"Authorization": f"Bearer {token}"})
+
+
+def _once_per_run(tmp_path_factory, name, produce):
+    """Call produce() once per run; under xdist the first worker shares its JSON result with the rest"""
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        return produce()
+    # Workers share a temp root; the first one to get the lock does the work for everyone
+    path = tmp_path_factory.getbasetemp().parent / f"{name}.json"
+    with FileLock(f"{path}.lock"):
+        if path.is_file():
+            return json.loads(path.read_text())
+        value = produce()
+        if value:
+            path.write_text(json.dumps(value))
+        return value
+
+
+def pytest_collection_modifyitems(config, items):
+    """Rerun a test up to twice when it fails on a network blip, if pytest-rerunfailures is installed
+    
+    Appended, so a test's own @pytest.mark.flaky still takes precedence.
+    """
+    if not config.pluginmanager.hasplugin("rerunfailures"):
+        return
+    for item in items:
+        item.add_marker(pytest.mark.flaky(reruns=2, reruns_delay=1, only_rerun=RERUN_ERRORS))
+
+
+def _scrub_tokens(response):
+    """vcr before_record_response: mask access_token in JSON bodies (login/register) before recording"""
+    body = response["body"]["string"]
+    try:
+        data = json.loads(body)
+    except (TypeError, ValueError):  # empty or non-JSON body
+        return response
+    if isinstance(data, dict) and "access_token" in data:
+        data["access_token"] = "<filtered>"
+        response["body"]["string"] = json.dumps(data).encode()
+    return response
+
+
+def _authorized(r1, r2):
+    """vcr matcher: both requests carry an Authorization header or neither does (its value is masked)"""
+    assert ("Authorization" in r1.headers) == ("Authorization" in r2.headers)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_recording_configure(config, vcr):
+    """Let per-test cassettes use the "authorized" matcher too"""
+    vcr.register_matcher("authorized", _authorized)
+
+
+def _has_cassettes():
+    return any(name.endswith(".yaml") for _, _, names in os.walk(CASSETTE_DIR) for name in names)
+
+
+def _replaying(config):
+    """True when recorded cassettes exist and the record mode replays them rather than re-recording"""
+    return vcr is not None and config["record_mode"] not in ("all", "rewrite") and _has_cassettes()
+
+
+def _fixture_cassette(config, name, **overrides):
+    """Cassette for session fixtures, which run before pytest-recording's per-test cassette is active
+    
+    Fixtures that run once per xdist worker put _WORKER in `name`, so workers never write the same
+    file; replaying those needs the same -n as the recording run.
+    """
+    if vcr is None:
+        return contextlib.nullcontext()
+    library = vcr.VCR(cassette_library_dir=os.path.join(CASSETTE_DIR, "session"))
+    library.register_matcher("authorized", _authorized)
+    return library.use_cassette(f"{name}.yaml", **{**config, **overrides})
+
+
+@pytest.fixture(scope="session")
+def fixture_cassette(vcr_config):
+    """fixture_cassette(name[, match_on=...]) records a class- or module-scoped fixture's calls, which run outside the test's cassette"""
+    return functools.partial(_fixture_cassette, vcr_config)
+
+
+@pytest.fixture(scope="session")
+def vcr_config(pytestconfig):
+    """Replay tests/cassettes/ if it holds recordings, else talk to the backend; record only on --record-mode
+    
+    Credentials stay out of cassettes: Authorization headers are masked, password fields are
+    dropped from requests, and access tokens are masked in login/register responses.
+    """
+    # "none" (replay only) is the plugin's default; recording takes an explicit --record-mode
+    record_mode = pytestconfig.getoption("record_mode", "none")
+    config = {
+        # Masked rather than dropped, so the "authorized" matcher still sees which calls had one
+        "filter_headers": [("authorization", "<filtered>")],
+        "filter_post_data_parameters": ["password"],
+        "decode_compressed_response": True,
+        "before_record_response": _scrub_tokens,
+        "record_mode": record_mode
+    }
+    if IN_PROCESS or (record_mode == "none" and not _has_cassettes()):
+        # Nothing to replay and no recording asked for (or responses come from the local app):
+        # every call goes through untouched and nothing lands in cassettes
+        config["before_record_request"] = lambda request: None
+    return config
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cached_dns():
+    """Resolve the backend host once per worker instead of on every new pooled connection"""
+    original = socket.getaddrinfo
+    socket.getaddrinfo = functools.lru_cache(maxsize=8)(original)
+    yield
+    socket.getaddrinfo = original
+
+
+class _TimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter applying REQUEST_TIMEOUT to calls that set none (requests never times out by default)"""
+    
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or REQUEST_TIMEOUT, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def http_adapter():
+    """One pool of warm TLS connections to the backend for the whole run; retries absorb gateway blips"""
+    adapter = _TimeoutAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    yield adapter
+    adapter.close()
+
+
+def _new_http2_client(headers=None):
+    """httpx client multiplexing every call over one HTTP/2 connection, or None without httpx[http2]
+    
+    The tests only use get/post with json=/headers= and read status_code, json() and text, which
+    httpx.Client already offers, so it stands in for a requests session unchanged.
+    """
+    if httpx is None:
+        return None
+    try:
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            headers={"Content-Type": "application/json", **(headers or {})},
+            timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0]),
+            follow_redirects=True
+        )
+    except ImportError:  # h2 missing
+        return None
+
+
+class _WithHeaders:
+    """Send through another client with extra default headers, so both share one in-process app"""
+    
+    def __init__(self, client, headers):
+        self.client = client
+        self.headers = headers
+    
+    def request(self, method, url, headers=None, **kwargs):
+        return self.client.request(method, url, headers={**self.headers, **(headers or {})}, **kwargs)
+    
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+    
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+    
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def api_client(http_adapter):
+    """Shared session (unauthenticated); HTTP2_TESTS=1 swaps in an HTTP/2 httpx client when available
+    
+    With TEST_IN_PROCESS=1 it is a TestClient on backend.server's app (needs the backend's .env and
+    a reachable MongoDB); TestClient routes the absolute BASE_URL calls to the app whatever the host.
+    """
+    if IN_PROCESS:
+        from fastapi.testclient import TestClient
+        from backend.server import app
+        # One client, entered once: startup runs and Motor stays on a single event loop
+        with TestClient(app, headers={"Content-Type": "application/json"}) as client:
+            yield client
+        return
+    client = _new_http2_client() if os.environ.get("HTTP2_TESTS") == "1" else None
+    if client is None:
+        client = _new_session(http_adapter)
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def backend_reachable(api_client, vcr_config):
+    """Skip the whole run at once when the backend can't be reached and nothing could replay instead
+    
+    Without this each test would wait out its own connect timeout. The check is left out only when
+    recorded cassettes exist and the record mode replays them rather than re-recording.
+    """
+    if IN_PROCESS or _replaying(vcr_config):
+        return
+    try:
+        api_client.get(f"{BASE_URL}/api/", timeout=3)
+    except TRANSPORT_ERRORS as exc:
+        pytest.skip(f"Backend unreachable at {BASE_URL}: {exc}")
+
+
+@pytest.fixture(scope="session")
+def admin_login_result(api_client, tmp_path_factory, vcr_config):
+    """admin_login_result("email" | "username") -> {"status_code", "text"} of admin's login, one POST per run
+    
+    auth_token and admin_login both read the "email" login from here, so a cold run sends it once.
+    """
+    identifiers = {"email": ADMIN_EMAIL, "username": ADMIN_USERNAME}
+    
+    @functools.cache
+    def result(kind):
+        def login():
+            with _fixture_cassette(vcr_config, f"admin_login_{kind}"):
+                response = api_client.post(f"{BASE_URL}/api/users/login", json={
+                    "email": identifiers[kind],
+                    "password": ADMIN_PASSWORD
+                })
+            return {"status_code": response.status_code, "text": response.text}
+        
+        return _once_per_run(tmp_path_factory, f"admin_login_{kind}", login)
+    
+    return result
+
+
+@pytest.fixture(scope="session")
+def auth_token(api_client, admin_login_result, tmp_path_factory, vcr_config, pytestconfig):
+    """Get authentication token for admin user, logging in once per run even across xdist workers
+    
+    The token is also kept in pytest's cache dir (keyed by backend and account, readable only by
+    the current user) and reused by later runs while /users/me accepts it and it is more than a
+    minute from expiring; -p no:cacheprovider turns that off. Replayed runs neither read nor
+    write it, since their login comes from the cassette.
+    """
+    cache = getattr(pytestconfig, "cache", None)
+    key = hashlib.sha256(f"{BASE_URL}|{ADMIN_EMAIL}|{IN_PROCESS}".encode()).hexdigest()[:16]
+    use_cache = cache is not None and not _replaying(vcr_config)
+    path = cache.mkdir("budget") / f"admin_token-{key}" if use_cache else None
+    
+    def cached_token():
+        try:
+            token = path.read_text()
+        except (AttributeError, OSError):  # no cache provider, or nothing stored yet
+            return None
+        if (jwt_expiry(token) or 0) - time.time() <= 60:
+            return None
+        # A token revoked server-side (e.g. after a secret rotation) is dropped and replaced
+        try:
+            with _fixture_cassette(vcr_config, "admin_token_check"):
+                response = api_client.get(f"{BASE_URL}/api/users/me", headers=_bearer(token))
+        except TRANSPORT_ERRORS:  # leave it to the login to succeed or skip
+            return None
+        if response.status_code == 401:
+            path.unlink(missing_ok=True)
+            return None
+        return token
+    
+    def login():
+        token = cached_token()
+        if token:
+            return token
+        result = admin_login_result("email")
+        if result["status_code"] != 200:
+            return None
+        token = json.loads(result["text"]).get("access_token")
+        if token and path is not None:
+            tmp = path.with_suffix(".tmp")
+            with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                f.write(token)
+            os.replace(tmp, path)
+        return token
+    
+    token = _once_per_run(tmp_path_factory, "admin_token", login)
+    if not token:
+        pytest.skip("Authentication failed - skipping authenticated tests")
+    return token
+
+
+@pytest.fixture(scope="session")
+def admin_token(auth_token):
+    """Admin token under the name the premium and checkout tests use"""
+    return auth_token
+
+
+@pytest.fixture(scope="session")
+def admin_login(request, admin_login_result):
+    """Admin's login response body for the "email" or "username" identifier
+    
+    For tests of the login endpoint itself; they pick the identifier with
+    @pytest.mark.parametrize("admin_login", [...], indirect=True). A refused login fails them.
+    """
+    result = admin_login_result(request.param)
+    assert result["status_code"] == 200, (
+        f"POST {BASE_URL}/api/users/login -> {result['status_code']}: {result['text']}"
+    )
+    return json.loads(result["text"])
+
+
+@pytest.fixture(scope="session")
+def admin_headers(admin_token):
+    """Authorization header for admin_token, for calls made through the unauthenticated api_client"""
+    return _bearer(admin_token)
+
+
+@pytest.fixture(scope="session")
+def admin_me(api_client, admin_headers, vcr_config):
+    """Admin's /users/me payload, fetched once and shared by every test that only reads it"""
+    with _fixture_cassette(vcr_config, f"admin_me-{_WORKER}"):
+        response = api_client.get(
+            f"{BASE_URL}/api/users/me",
+            headers=admin_headers
+        )
+    response.raise_for_status()
+    return response.json()
+
+
+def _bearer_client(http_adapter, api_client, token):
+    """Client of the same kind as api_client (own pool or own HTTP/2 connection) sending `token`"""
+    auth_header = _bearer(token)
+    if IN_PROCESS:
+        return _WithHeaders(api_client, auth_header)
+    client = None if isinstance(api_client, requests.Session) else _new_http2_client(auth_header)
+    if client is None:
+        client = _new_session(http_adapter)
+        client.headers.update(auth_header)
+    return client
+
+
+@pytest.fixture(scope="session")
+def authenticated_client(http_adapter, api_client, auth_token):
+    """Session with auth header - separate from api_client so unauthenticated tests stay unauthenticated
+    
+    It is the same kind of client as api_client (its own pool, or its own HTTP/2 connection), with
+    the header set once at construction rather than on every call.
+    """
+    client = _bearer_client(http_adapter, api_client, auth_token)
+    yield client
+    if httpx is not None and isinstance(client, httpx.Client):
+        client.close()
+
+
+@pytest.fixture(scope="session")
+def worker_user_client(http_adapter, api_client, vcr_config):
+    """Client for a throwaway user registered by this worker, deleted with its data at the end
+    
+    For user-scoped writes (transactions, custom categories): workers don't contend on admin's rows
+    and the lists they read stay small. Envelopes and recurring transactions are global on the
+    backend, so those tests keep using authenticated_client.
+    """
+    username = _account(_testid("cruduser"))
+    with _fixture_cassette(vcr_config, f"worker_user-{_WORKER}"):
+        response = api_client.post(f"{BASE_URL}/api/users/register", json={
+            "email": f"{username}@test.com",
+            "username": username,
+            "password": "Test123!"
+        })
+    client = _bearer_client(http_adapter, api_client, _ok_json(response)["access_token"])
+    yield client
+    with _fixture_cassette(vcr_config, f"worker_user-{_WORKER}"):
+        client.delete(f"{BASE_URL}/api/users/delete-account")
+    if httpx is not None and isinstance(client, httpx.Client):
+        client.close()
+
+
+@pytest.fixture(scope="session")
+def send_prepared():
+    """Send through per-(session, method, path) PreparedRequest templates built once per run
+    
+    Skips Session.request's URL parsing and header merging on endpoints hit many times; only
+    the JSON body is prepared per call. Environment proxy settings are not re-read.
+    """
+    templates = {}
+    
+    def send(session, method, path, json=None):
+        if not isinstance(session, requests.Session):  # in-process or httpx clients prepare per call
+            return session.request(method, f"{BASE_URL}{path}", json=json)
+        key = (id(session), method, path)
+        template = templates.get(key)
+        if template is None:
+            template = templates[key] = session.prepare_request(requests.Request(method, f"{BASE_URL}{path}"))
+        prepared = template.copy()
+        if json is not None:
+            prepared.prepare_body(data=None, files=None, json=json)
+        return session.send(prepared)
+    
+    return send
+
+
+def _ok_json(response, required=frozenset()):
+    """Body of a 200 response, parsed straight from bytes; anything else fails with status and body
+    
+    `required` top-level keys are checked in one set difference, reporting every missing key.
+    """
+    assert response.status_code == 200, (
+        f"{response.request.method} {response.url} -> {response.status_code}: {response.text}"
+    )
+    data = json.loads(response.content)
+    if required:
+        missing = required - data.keys()
+        assert not missing, f"{response.url} missing fields: {sorted(missing)}"
+    return data
+
+
+@pytest.fixture(scope="session")
+def ok_json():
+    """ok_json(response[, required]) replaces `assert response.status_code == 200; data = response.json()`"""
+    return _ok_json
+
+
+CANNED_LLM_ANSWER = "Canned test answer: no OpenAI call was made."
+
+
+@pytest.fixture
+def canned_llm(api_client, monkeypatch):
+    """In-process runs answer /ai-assistant questions with CANNED_LLM_ANSWER instead of calling OpenAI
+    
+    Over HTTP the backend's own OpenAI call can't be swapped out; there the cassette replays the
+    recorded answer. LIVE_LLM=1 keeps the real model in-process too (nightly integration run).
+    """
+    if not IN_PROCESS or os.environ.get("LIVE_LLM") == "1":
+        return
+    from routes import ai  # importable once api_client has loaded backend.server
+    
+    async def create(**kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=CANNED_LLM_ANSWER))])
+    
+    completions = SimpleNamespace(create=create)
+    monkeypatch.setattr(ai, "AsyncOpenAI", lambda **kwargs: SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    monkeypatch.setenv("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY") or "test-key")
+
+
+@pytest.fixture
+def testid(request):
+    """testid("TEST_Envelope") -> "TEST_Envelope_1a2b3c4d", seeded by this test's node id"""
+    return _testid_for(request.node.nodeid)
+
+
+@pytest.fixture(scope="session")
+def account():
+    """account(testid("freeuser")) makes a username or email unique to this run"""
+    return _account
+
+
+@pytest.fixture(scope="session")
+def testid_for():
+    """testid_for(request.node) gives class- or module-scoped fixtures their own testid"""
+    return lambda node: _testid_for(node.nodeid)
+
+
+@pytest.fixture(scope="session")
+def parallel_gets(request, api_client, vcr_config):
+    """Fan the stateless read-only GETs out over the pool at once; tests take .result() by path"""
+    try:
+        authenticated = request.getfixturevalue("authenticated_client")
+    except pytest.skip.Exception:
+        authenticated = None
+    
+    with ThreadPoolExecutor(max_workers=16) as pool, _fixture_cassette(vcr_config, f"parallel_gets-{_WORKER}"):
+        futures = {path: pool.submit(api_client.get, f"{BASE_URL}{path}") for path in PUBLIC_GETS}
+        for path in PRIVATE_GETS:
+            if authenticated is None:
+                # .result() re-raises the skip, so only the authenticated tests are skipped
+                futures[path] = pool.submit(pytest.skip, "Authentication failed - skipping authenticated tests")
+            else:
+                futures[path] = pool.submit(authenticated.get, f"{BASE_URL}{path}")
+        wait(futures.values())
+    return futures
+
+
+@pytest.fixture(scope="session")
+def trial_user_data(api_client, tmp_path_factory, vcr_config):
+    """Register a new user for trial testing, once per run even across xdist workers"""
+    def register():
+        with _fixture_cassette(vcr_config, "trial_user"):
+            response = api_client.post(f"{BASE_URL}/api/users/register", json={
+                "email": TRIAL_TEST_EMAIL,
+                "username": TRIAL_TEST_USERNAME,
+                "password": TRIAL_TEST_PASSWORD
+            })
+        if response.status_code != 200:
+            pytest.skip(f"User registration failed: {response.text}")
+        data = response.json()
+        return {
+            "token": data["access_token"],
+            "user_id": data["user_id"],
+            "email": TRIAL_TEST_EMAIL
+        }
+    
+    user = _once_per_run(tmp_path_factory, "trial_user", register)
+    return {**user, "headers": _bearer(user["token"])}
+
+
+@pytest.fixture(scope="session")
+def free_user_data(api_client, vcr_config):
+    """Register a new free user for testing"""
+    username = _account(_testid("freeuser"))
+    email = f"{username}@test.com"
+    password = "Test123!"
+    
+    with _fixture_cassette(vcr_config, f"free_user-{_WORKER}"):
+        response = api_client.post(f"{BASE_URL}/api/users/register", json={
+            "email": email,
+            "username": username,
+            "password": password
+        })
+    if response.status_code == 200:
+        data = response.json()
+        return {
+            "token": data["access_token"],
+            "headers": _bearer(data["access_token"]),
+            "user_id": data["user_id"],
+            "email": email,
+            "username": username
+        }
+    pytest.skip(f"User registration failed: {response.text}")
+
+
+@pytest.fixture
+def fresh_user_token(api_client, testid):
+    """Token of a user registered for this test alone"""
+    username = _account(testid("freshuser"))
+    response = api_client.post(f"{BASE_URL}/api/users/register", json={
+        "email": f"{username}@test.com",
+        "username": username,
+        "password": "Test123!"
+    })
+    if response.status_code != 200:
+        pytest.skip(f"User registration failed: {response.text}")
+    return response.json()["access_token"]
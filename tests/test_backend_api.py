@@ -3,74 +3,48 @@ Backend API Tests for FinanceHub Application
 Tests: Authentication, Budget Envelopes, Transactions, Quote of Day
 """
 import pytest
+import logging
 import requests
 import os
-import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://vaulton-preview.preview.emergentagent.com')
 
-# Test credentials
-ADMIN_EMAIL = "admin@financehub.com"
-ADMIN_PASSWORD = "admin"
+# Replay recorded responses from tests/cassettes/<module>/ (pytest-recording)
+pytestmark = pytest.mark.vcr
 
+log = logging.getLogger(__name__)
 
-@pytest.fixture(scope="module")
-def api_client():
-    """Shared requests session"""
-    session = requests.Session()
-    session.headers.update({"Content-Type": "application/json"})
-    return session
-
-
-@pytest.fixture(scope="module")
-def auth_token(api_client):
-    """Get authentication token for admin user"""
-    response = api_client.post(f"{BASE_URL}/api/users/login", json={
-        "email": ADMIN_EMAIL,
-        "password": ADMIN_PASSWORD
-    })
-    if response.status_code == 200:
-        return response.json().get("access_token")
-    pytest.skip("Authentication failed - skipping authenticated tests")
-
-
-@pytest.fixture(scope="module")
-def authenticated_client(api_client, auth_token):
-    """Session with auth header"""
-    api_client.headers.update({"Authorization": f"Bearer {auth_token}"})
-    return api_client
+# Required top-level keys of /transactions/summary, checked by ok_json
+SUMMARY_FIELDS = frozenset({"totalIncome", "totalExpenses", "balance"})
 
 
 class TestHealthCheck:
     """Basic API health check tests"""
     
-    def test_api_root(self, api_client):
+    def test_api_root(self, parallel_gets, ok_json):
         """Test API root endpoint returns success"""
-        response = api_client.get(f"{BASE_URL}/api/")
-        assert response.status_code == 200
-        data = response.json()
+        response = parallel_gets["/api/"].result()
+        data = ok_json(response)
         assert "message" in data
         assert data["message"] == "Financial Tracker API"
-        print("✅ API root endpoint working")
+        log.info("✅ API root endpoint working")
 
 
 class TestAuthentication:
     """Authentication endpoint tests"""
     
-    def test_login_success(self, api_client):
+    @pytest.mark.parametrize("admin_login", ["email"], indirect=True)
+    def test_login_success(self, admin_login):
         """Test successful login with admin credentials"""
-        response = api_client.post(f"{BASE_URL}/api/users/login", json={
-            "email": ADMIN_EMAIL,
-            "password": ADMIN_PASSWORD
-        })
-        assert response.status_code == 200
-        data = response.json()
+        data = admin_login
         assert "access_token" in data
         assert "user_id" in data
         assert "is_premium" in data
         assert isinstance(data["access_token"], str)
         assert len(data["access_token"]) > 0
-        print(f"✅ Login successful, is_premium: {data['is_premium']}")
+        log.info(f"✅ Login successful, is_premium: {data['is_premium']}")
     
     def test_login_invalid_credentials(self, api_client):
         """Test login with invalid credentials returns 401"""
@@ -79,179 +53,188 @@ class TestAuthentication:
             "password": "wrongpass"
         })
         assert response.status_code == 401
-        print("✅ Invalid credentials correctly rejected")
+        log.info("✅ Invalid credentials correctly rejected")
 
 
 class TestQuoteOfDay:
     """Quote of Day feature tests"""
     
-    def test_get_quote(self, api_client):
+    def test_get_quote(self, parallel_gets, ok_json):
         """Test quote of day endpoint returns valid quote"""
-        response = api_client.get(f"{BASE_URL}/api/quote-of-day")
-        assert response.status_code == 200
-        data = response.json()
+        response = parallel_gets["/api/quote-of-day"].result()
+        data = ok_json(response)
         assert "quote" in data
         assert "author" in data
         assert "date" in data
         assert isinstance(data["quote"], str)
         assert len(data["quote"]) > 0
-        print(f"✅ Quote retrieved: '{data['quote'][:50]}...'")
-
-
+        log.info(f"✅ Quote retrieved: '{data['quote'][:50]}...'")
+
+
+@dataclass
+class EnvelopeLifecycle:
+    """Responses from one create -> transact -> delete run against the envelope endpoints"""
+    envelope_id: str
+    transaction_id: str
+    create: requests.Response
+    list_after_create: requests.Response
+    add_transaction: requests.Response
+    list_transactions: requests.Response
+    delete_transaction: requests.Response
+    list_after_transaction_delete: requests.Response
+    delete_envelope: requests.Response
+    list_after_delete: requests.Response
+
+
+@pytest.fixture(scope="class")
+def envelope_lifecycle(request, authenticated_client, send_prepared, testid_for, fixture_cassette):
+    """Run the whole envelope lifecycle once; the tests below only assert on its responses"""
+    client = authenticated_client
+    testid = testid_for(request.node)
+    with fixture_cassette("envelope_lifecycle"):
+        create = send_prepared(client, "POST", "/api/budget-envelopes", json={
+            "name": testid("TEST_Envelope"),
+            "target_amount": 3000,
+            "currency": "USD",
+            "description": "Test envelope for automated testing"
+        })
+        assert create.status_code == 200, f"Envelope creation failed: {create.text}"
+        envelope_id = create.json()["id"]
+        transactions_url = f"{BASE_URL}/api/budget-envelopes/{envelope_id}/transactions"
+        
+        # Listing envelopes and depositing into the new one don't depend on each other
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            listed = pool.submit(send_prepared, client, "GET", "/api/budget-envelopes")
+            add_transaction = client.post(transactions_url, json={
+                "type": "income",
+                "amount": 500,
+                "description": "Test deposit",
+                "category": "Savings",
+                "date": "2025-01-14"
+            })
+            list_after_create = listed.result()
+        assert add_transaction.status_code == 200, f"Envelope deposit failed: {add_transaction.text}"
+        transaction_id = add_transaction.json()["id"]
+        
+        list_transactions = client.get(transactions_url)
+        delete_transaction = client.delete(f"{transactions_url}/{transaction_id}")
+        list_after_transaction_delete = client.get(transactions_url)
+        delete_envelope = client.delete(f"{BASE_URL}/api/budget-envelopes/{envelope_id}")
+        list_after_delete = send_prepared(client, "GET", "/api/budget-envelopes")
+    
+    return EnvelopeLifecycle(
+        envelope_id=envelope_id,
+        transaction_id=transaction_id,
+        create=create,
+        list_after_create=list_after_create,
+        add_transaction=add_transaction,
+        list_transactions=list_transactions,
+        delete_transaction=delete_transaction,
+        list_after_transaction_delete=list_after_transaction_delete,
+        delete_envelope=delete_envelope,
+        list_after_delete=list_after_delete
+    )
+
+
+@pytest.mark.xdist_group(name="envelope_lifecycle")
 class TestBudgetEnvelopes:
     """Budget Envelopes CRUD tests"""
     
-    @pytest.fixture(autouse=True)
-    def setup(self, authenticated_client):
-        """Store client for use in tests"""
-        self.client = authenticated_client
-        self.created_envelope_id = None
-        self.created_transaction_id = None
-    
-    def test_01_list_envelopes(self):
+    def test_01_list_envelopes(self, envelope_lifecycle, ok_json):
         """Test listing budget envelopes"""
-        response = self.client.get(f"{BASE_URL}/api/budget-envelopes")
-        assert response.status_code == 200
-        data = response.json()
+        response = envelope_lifecycle.list_after_create
+        data = ok_json(response)
         assert isinstance(data, list)
-        print(f"✅ Listed {len(data)} envelopes")
+        log.info(f"✅ Listed {len(data)} envelopes")
     
-    def test_02_create_envelope(self):
+    def test_02_create_envelope(self, envelope_lifecycle):
         """Test creating a new budget envelope"""
-        unique_name = f"TEST_Envelope_{uuid.uuid4().hex[:8]}"
-        create_payload = {
-            "name": unique_name,
-            "target_amount": 3000,
-            "currency": "USD",
-            "description": "Test envelope for automated testing"
-        }
-        response = self.client.post(f"{BASE_URL}/api/budget-envelopes", json=create_payload)
-        assert response.status_code == 200
-        data = response.json()
+        data = envelope_lifecycle.create.json()
         assert "id" in data
         assert "message" in data
-        TestBudgetEnvelopes.created_envelope_id = data["id"]
-        print(f"✅ Created envelope: {data['id']}")
+        log.info(f"✅ Created envelope: {data['id']}")
     
-    def test_03_verify_envelope_created(self):
+    def test_03_verify_envelope_created(self, envelope_lifecycle):
         """Verify envelope was persisted by fetching it"""
-        response = self.client.get(f"{BASE_URL}/api/budget-envelopes")
-        assert response.status_code == 200
-        data = response.json()
-        envelope_ids = [e["id"] for e in data]
-        assert TestBudgetEnvelopes.created_envelope_id in envelope_ids
-        print("✅ Envelope verified in list")
+        envelope_ids = [e["id"] for e in envelope_lifecycle.list_after_create.json()]
+        assert envelope_lifecycle.envelope_id in envelope_ids
+        log.info("✅ Envelope verified in list")
     
-    def test_04_add_transaction_to_envelope(self):
+    def test_04_add_transaction_to_envelope(self, envelope_lifecycle):
         """Test adding a transaction to an envelope"""
-        envelope_id = TestBudgetEnvelopes.created_envelope_id
-        assert envelope_id is not None, "Envelope ID not set from previous test"
-        
-        transaction_payload = {
-            "type": "income",
-            "amount": 500,
-            "description": "Test deposit",
-            "category": "Savings",
-            "date": "2025-01-14"
-        }
-        response = self.client.post(
-            f"{BASE_URL}/api/budget-envelopes/{envelope_id}/transactions",
-            json=transaction_payload
-        )
-        assert response.status_code == 200
-        data = response.json()
+        data = envelope_lifecycle.add_transaction.json()
         assert "id" in data
-        TestBudgetEnvelopes.created_transaction_id = data["id"]
-        print(f"✅ Created transaction: {data['id']}")
+        log.info(f"✅ Created transaction: {data['id']}")
     
-    def test_05_verify_transaction_created(self):
+    def test_05_verify_transaction_created(self, envelope_lifecycle, ok_json):
         """Verify transaction was persisted"""
-        envelope_id = TestBudgetEnvelopes.created_envelope_id
-        response = self.client.get(f"{BASE_URL}/api/budget-envelopes/{envelope_id}/transactions")
-        assert response.status_code == 200
-        data = response.json()
+        response = envelope_lifecycle.list_transactions
+        data = ok_json(response)
         assert isinstance(data, list)
         assert len(data) > 0
         transaction_ids = [t["id"] for t in data]
-        assert TestBudgetEnvelopes.created_transaction_id in transaction_ids
-        print(f"✅ Transaction verified, total: {len(data)}")
+        assert envelope_lifecycle.transaction_id in transaction_ids
+        log.info(f"✅ Transaction verified, total: {len(data)}")
     
-    def test_06_delete_transaction(self):
+    def test_06_delete_transaction(self, envelope_lifecycle, ok_json):
         """Test deleting a transaction from envelope"""
-        envelope_id = TestBudgetEnvelopes.created_envelope_id
-        transaction_id = TestBudgetEnvelopes.created_transaction_id
-        
-        response = self.client.delete(
-            f"{BASE_URL}/api/budget-envelopes/{envelope_id}/transactions/{transaction_id}"
-        )
-        assert response.status_code == 200
-        data = response.json()
+        response = envelope_lifecycle.delete_transaction
+        data = ok_json(response)
         assert "message" in data
-        print("✅ Transaction deleted")
+        log.info("✅ Transaction deleted")
     
-    def test_07_verify_transaction_deleted(self):
+    def test_07_verify_transaction_deleted(self, envelope_lifecycle):
         """Verify transaction was removed"""
-        envelope_id = TestBudgetEnvelopes.created_envelope_id
-        response = self.client.get(f"{BASE_URL}/api/budget-envelopes/{envelope_id}/transactions")
+        response = envelope_lifecycle.list_after_transaction_delete
         assert response.status_code == 200
-        data = response.json()
-        transaction_ids = [t["id"] for t in data]
-        assert TestBudgetEnvelopes.created_transaction_id not in transaction_ids
-        print("✅ Transaction deletion verified")
+        transaction_ids = [t["id"] for t in response.json()]
+        assert envelope_lifecycle.transaction_id not in transaction_ids
+        log.info("✅ Transaction deletion verified")
     
-    def test_08_delete_envelope(self):
+    def test_08_delete_envelope(self, envelope_lifecycle, ok_json):
         """Test deleting a budget envelope"""
-        envelope_id = TestBudgetEnvelopes.created_envelope_id
-        response = self.client.delete(f"{BASE_URL}/api/budget-envelopes/{envelope_id}")
-        assert response.status_code == 200
-        data = response.json()
+        response = envelope_lifecycle.delete_envelope
+        data = ok_json(response)
         assert "message" in data
-        print("✅ Envelope deleted")
+        log.info("✅ Envelope deleted")
     
-    def test_09_verify_envelope_deleted(self):
+    def test_09_verify_envelope_deleted(self, envelope_lifecycle):
         """Verify envelope was removed"""
-        response = self.client.get(f"{BASE_URL}/api/budget-envelopes")
+        response = envelope_lifecycle.list_after_delete
         assert response.status_code == 200
-        data = response.json()
-        envelope_ids = [e["id"] for e in data]
-        assert TestBudgetEnvelopes.created_envelope_id not in envelope_ids
-        print("✅ Envelope deletion verified")
+        envelope_ids = [e["id"] for e in response.json()]
+        assert envelope_lifecycle.envelope_id not in envelope_ids
+        log.info("✅ Envelope deletion verified")
 
 
 class TestCurrencies:
     """Currency endpoint tests"""
     
-    def test_get_currencies(self, api_client):
+    def test_get_currencies(self, parallel_gets, ok_json):
         """Test currencies endpoint returns list"""
-        response = api_client.get(f"{BASE_URL}/api/currencies")
-        assert response.status_code == 200
-        data = response.json()
+        response = parallel_gets["/api/currencies"].result()
+        data = ok_json(response)
         assert "currencies" in data
         assert isinstance(data["currencies"], list)
         assert "USD" in data["currencies"]
-        print(f"✅ Retrieved {len(data['currencies'])} currencies")
+        log.info(f"✅ Retrieved {len(data['currencies'])} currencies")
 
 
 class TestTransactions:
     """Main transaction endpoint tests"""
     
-    def test_get_transactions(self, authenticated_client):
+    def test_get_transactions(self, parallel_gets, ok_json):
         """Test listing transactions"""
-        response = authenticated_client.get(f"{BASE_URL}/api/transactions")
-        assert response.status_code == 200
-        data = response.json()
+        response = parallel_gets["/api/transactions"].result()
+        data = ok_json(response)
         assert isinstance(data, list)
-        print(f"✅ Listed {len(data)} transactions")
+        log.info(f"✅ Listed {len(data)} transactions")
     
-    def test_get_summary(self, authenticated_client):
+    def test_get_summary(self, parallel_gets, ok_json):
         """Test transaction summary endpoint"""
-        response = authenticated_client.get(f"{BASE_URL}/api/transactions/summary")
-        assert response.status_code == 200
-        data = response.json()
-        assert "totalIncome" in data
-        assert "totalExpenses" in data
-        assert "balance" in data
-        print(f"✅ Summary: Income={data['totalIncome']}, Expenses={data['totalExpenses']}")
+        response = parallel_gets["/api/transactions/summary"].result()
+        data = ok_json(response, SUMMARY_FIELDS)
+        log.info(f"✅ Summary: Income={data['totalIncome']}, Expenses={data['totalExpenses']}")
 
 
 if __name__ == "__main__":
@@ -3,106 +3,58 @@ Premium Tier Enhancement Tests for FinanceHub Application
 Tests: Free Trial, Trial Status, User /me endpoint with trial fields, Discount eligibility
 """
 import pytest
-import requests
+import logging
 import os
-import uuid
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://vaulton-preview.preview.emergentagent.com')
 
-# Test credentials
-ADMIN_EMAIL = "admin@financehub.com"
-ADMIN_PASSWORD = "admin"
-TRIAL_TEST_EMAIL = f"trialtest_{uuid.uuid4().hex[:8]}@example.com"
-TRIAL_TEST_PASSWORD = "test123"
-TRIAL_TEST_USERNAME = f"trialuser_{uuid.uuid4().hex[:8]}"
+# Replay recorded responses from tests/cassettes/<module>/ (pytest-recording)
+pytestmark = pytest.mark.vcr
 
+log = logging.getLogger(__name__)
 
-@pytest.fixture(scope="module")
-def api_client():
-    """Shared requests session"""
-    session = requests.Session()
-    session.headers.update({"Content-Type": "application/json"})
-    return session
+# Account fields plus the trial-specific ones /users/me must return
+EXPECTED_ME_FIELDS = frozenset({
+    "user_id", "email", "username", "subscription_level", "is_premium",
+    "trial_started_at", "trial_expires_at", "trial_used", "is_trial",
+    "discount_eligible", "discount_used"
+})
 
-
-@pytest.fixture(scope="module")
-def admin_token(api_client):
-    """Get authentication token for admin user"""
-    response = api_client.post(f"{BASE_URL}/api/users/login", json={
-        "email": ADMIN_EMAIL,
-        "password": ADMIN_PASSWORD
-    })
-    if response.status_code == 200:
-        return response.json().get("access_token")
-    pytest.skip("Admin authentication failed")
-
-
-@pytest.fixture(scope="module")
-def trial_user_data(api_client):
-    """Register a new user for trial testing"""
-    response = api_client.post(f"{BASE_URL}/api/users/register", json={
-        "email": TRIAL_TEST_EMAIL,
-        "username": TRIAL_TEST_USERNAME,
-        "password": TRIAL_TEST_PASSWORD
-    })
-    if response.status_code == 200:
-        data = response.json()
-        return {
-            "token": data["access_token"],
-            "user_id": data["user_id"],
-            "email": TRIAL_TEST_EMAIL
-        }
-    pytest.skip(f"User registration failed: {response.text}")
+# The checkout calls share a URL and are recorded in whatever order they finish, so replay
+# tells them apart by body as well
+CHECKOUT_MATCH_ON = ("method", "scheme", "host", "port", "path", "query", "body")
 
 
 class TestUserMeEndpoint:
     """Test /users/me endpoint returns trial fields"""
     
-    def test_me_endpoint_returns_trial_fields(self, api_client, admin_token):
+    def test_me_endpoint_returns_trial_fields(self, admin_me):
         """Test that /me endpoint returns all trial-related fields"""
-        response = api_client.get(
-            f"{BASE_URL}/api/users/me",
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
-        assert response.status_code == 200
-        data = response.json()
-        
-        # Check all required fields exist
-        assert "user_id" in data
-        assert "email" in data
-        assert "username" in data
-        assert "subscription_level" in data
-        assert "is_premium" in data
+        data = admin_me
         
-        # Check trial-specific fields exist
-        assert "trial_started_at" in data, "Missing trial_started_at field"
-        assert "trial_expires_at" in data, "Missing trial_expires_at field"
-        assert "trial_used" in data, "Missing trial_used field"
-        assert "is_trial" in data, "Missing is_trial field"
-        assert "discount_eligible" in data, "Missing discount_eligible field"
-        assert "discount_used" in data, "Missing discount_used field"
+        missing = EXPECTED_ME_FIELDS - data.keys()
+        assert not missing, f"Missing fields: {sorted(missing)}"
         
-        print(f"✅ /me endpoint returns all trial fields")
-        print(f"   - is_premium: {data['is_premium']}")
-        print(f"   - is_trial: {data['is_trial']}")
-        print(f"   - trial_used: {data['trial_used']}")
-        print(f"   - discount_eligible: {data['discount_eligible']}")
+        log.info(f"✅ /me endpoint returns all trial fields")
+        log.info(f"   - is_premium: {data['is_premium']}")
+        log.info(f"   - is_trial: {data['is_trial']}")
+        log.info(f"   - trial_used: {data['trial_used']}")
+        log.info(f"   - discount_eligible: {data['discount_eligible']}")
 
 
+@pytest.mark.xdist_group(name="trial_user")
 class TestFreeTrialEndpoint:
     """Test /subscription/start-trial endpoint"""
     
-    def test_start_trial_success(self, api_client, trial_user_data):
+    def test_start_trial_success(self, api_client, trial_user_data, ok_json):
         """Test starting a 3-day free trial for new user"""
-        token = trial_user_data["token"]
-        
         response = api_client.post(
             f"{BASE_URL}/api/subscription/start-trial",
-            headers={"Authorization": f"Bearer {token}"}
+            headers=trial_user_data["headers"]
         )
-        assert response.status_code == 200
-        data = response.json()
+        data = ok_json(response)
         
         # Verify response structure
         assert data["status"] == "success"
@@ -112,35 +64,30 @@ class TestFreeTrialEndpoint:
         assert data["days_remaining"] == 3
         assert "3-day free trial has started" in data["message"]
         
-        print(f"✅ Trial started successfully")
-        print(f"   - Started: {data['trial_started_at']}")
-        print(f"   - Expires: {data['trial_expires_at']}")
-        print(f"   - Days remaining: {data['days_remaining']}")
+        log.info(f"✅ Trial started successfully")
+        log.info(f"   - Started: {data['trial_started_at']}")
+        log.info(f"   - Expires: {data['trial_expires_at']}")
+        log.info(f"   - Days remaining: {data['days_remaining']}")
     
     def test_start_trial_twice_fails(self, api_client, trial_user_data):
         """Test that starting trial twice returns error"""
-        token = trial_user_data["token"]
-        
         response = api_client.post(
             f"{BASE_URL}/api/subscription/start-trial",
-            headers={"Authorization": f"Bearer {token}"}
+            headers=trial_user_data["headers"]
         )
         assert response.status_code == 400
         data = response.json()
         assert "already used" in data["detail"].lower()
         
-        print(f"✅ Second trial attempt correctly rejected: {data['detail']}")
+        log.info(f"✅ Second trial attempt correctly rejected: {data['detail']}")
     
-    def test_trial_user_has_premium_access(self, api_client, trial_user_data):
+    def test_trial_user_has_premium_access(self, api_client, trial_user_data, ok_json):
         """Test that trial user gets is_premium=true during trial"""
-        token = trial_user_data["token"]
-        
         response = api_client.get(
             f"{BASE_URL}/api/users/me",
-            headers={"Authorization": f"Bearer {token}"}
+            headers=trial_user_data["headers"]
         )
-        assert response.status_code == 200
-        data = response.json()
+        data = ok_json(response)
         
         # Trial user should have premium access
         assert data["is_trial"] == True, "is_trial should be True"
@@ -148,25 +95,23 @@ class TestFreeTrialEndpoint:
         assert data["trial_used"] == True, "trial_used should be True"
         assert data["trial_expires_at"] is not None, "trial_expires_at should be set"
         
-        print(f"✅ Trial user has premium access")
-        print(f"   - is_trial: {data['is_trial']}")
-        print(f"   - is_premium: {data['is_premium']}")
-        print(f"   - trial_expires_at: {data['trial_expires_at']}")
+        log.info(f"✅ Trial user has premium access")
+        log.info(f"   - is_trial: {data['is_trial']}")
+        log.info(f"   - is_premium: {data['is_premium']}")
+        log.info(f"   - trial_expires_at: {data['trial_expires_at']}")
 
 
+@pytest.mark.xdist_group(name="trial_user")
 class TestTrialStatusEndpoint:
     """Test /subscription/trial-status endpoint"""
     
-    def test_trial_status_for_trial_user(self, api_client, trial_user_data):
+    def test_trial_status_for_trial_user(self, api_client, trial_user_data, ok_json):
         """Test trial status endpoint returns correct data for trial user"""
-        token = trial_user_data["token"]
-        
         response = api_client.get(
             f"{BASE_URL}/api/subscription/trial-status",
-            headers={"Authorization": f"Bearer {token}"}
+            headers=trial_user_data["headers"]
         )
-        assert response.status_code == 200
-        data = response.json()
+        data = ok_json(response)
         
         # Verify response structure
         assert "trial_used" in data
@@ -183,41 +128,36 @@ class TestTrialStatusEndpoint:
         assert data["days_remaining"] > 0
         assert data["discount_eligible"] == False  # Not eligible while trial is active
         
-        print(f"✅ Trial status endpoint working")
-        print(f"   - is_trial_active: {data['is_trial_active']}")
-        print(f"   - days_remaining: {data['days_remaining']}")
-        print(f"   - discount_eligible: {data['discount_eligible']}")
+        log.info(f"✅ Trial status endpoint working")
+        log.info(f"   - is_trial_active: {data['is_trial_active']}")
+        log.info(f"   - days_remaining: {data['days_remaining']}")
+        log.info(f"   - discount_eligible: {data['discount_eligible']}")
 
 
 class TestAdminPremiumStatus:
     """Test admin user premium status"""
     
-    def test_admin_is_premium(self, api_client, admin_token):
+    def test_admin_is_premium(self, admin_me):
         """Test that admin user is always premium"""
-        response = api_client.get(
-            f"{BASE_URL}/api/users/me",
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
-        assert response.status_code == 200
-        data = response.json()
+        data = admin_me
         
         assert data["is_premium"] == True, "Admin should always be premium"
         assert data["is_trial"] == False, "Admin should not be on trial"
         
-        print(f"✅ Admin user has premium status")
-        print(f"   - email: {data['email']}")
-        print(f"   - is_premium: {data['is_premium']}")
-        print(f"   - is_trial: {data['is_trial']}")
+        log.info(f"✅ Admin user has premium status")
+        log.info(f"   - email: {data['email']}")
+        log.info(f"   - is_premium: {data['is_premium']}")
+        log.info(f"   - is_trial: {data['is_trial']}")
 
 
 class TestFreeUserStatus:
     """Test free user without trial"""
     
-    def test_new_user_is_free(self, api_client):
+    def test_new_user_is_free(self, api_client, testid, account, ok_json):
         """Test that new user starts as free tier"""
         # Register a new user
-        new_email = f"freeuser_{uuid.uuid4().hex[:8]}@example.com"
-        new_username = f"freeuser_{uuid.uuid4().hex[:8]}"
+        new_email = f"{account(testid('freeuser'))}@example.com"
+        new_username = account(testid("freeuser"))
         
         response = api_client.post(f"{BASE_URL}/api/users/register", json={
             "email": new_email,
@@ -232,77 +172,63 @@ class TestFreeUserStatus:
             f"{BASE_URL}/api/users/me",
             headers={"Authorization": f"Bearer {token}"}
         )
-        assert response.status_code == 200
-        data = response.json()
+        data = ok_json(response)
         
         assert data["subscription_level"] == "free"
         assert data["is_premium"] == False
         assert data["is_trial"] == False
         assert data["trial_used"] == False
         
-        print(f"✅ New user starts as free tier")
-        print(f"   - subscription_level: {data['subscription_level']}")
-        print(f"   - is_premium: {data['is_premium']}")
-        print(f"   - trial_used: {data['trial_used']}")
+        log.info(f"✅ New user starts as free tier")
+        log.info(f"   - subscription_level: {data['subscription_level']}")
+        log.info(f"   - is_premium: {data['is_premium']}")
+        log.info(f"   - trial_used: {data['trial_used']}")
 
 
-class TestSubscriptionPackages:
-    """Test subscription checkout endpoints"""
-    
-    def test_create_checkout_monthly(self, api_client, admin_token):
-        """Test creating monthly checkout session"""
-        response = api_client.post(
+@pytest.fixture(scope="class")
+def checkout_responses(api_client, admin_headers, fixture_cassette):
+    """Create-checkout responses keyed by package_id; the three calls are independent, so sent at once"""
+    def create_checkout(package_id):
+        return api_client.post(
             f"{BASE_URL}/api/subscription/create-checkout",
             json={
-                "package_id": "monthly",
+                "package_id": package_id,
                 "origin_url": "https://vaulton-preview.preview.emergentagent.com",
                 "apply_discount": False
             },
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers=admin_headers
         )
-        assert response.status_code == 200
-        data = response.json()
-        
-        assert "checkout_url" in data
-        assert "session_id" in data
-        assert data["checkout_url"].startswith("https://")
-        
-        print(f"✅ Monthly checkout session created")
-        print(f"   - session_id: {data['session_id'][:20]}...")
     
-    def test_create_checkout_yearly(self, api_client, admin_token):
-        """Test creating yearly checkout session"""
-        response = api_client.post(
-            f"{BASE_URL}/api/subscription/create-checkout",
-            json={
-                "package_id": "yearly",
-                "origin_url": "https://vaulton-preview.preview.emergentagent.com",
-                "apply_discount": False
-            },
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
-        assert response.status_code == 200
-        data = response.json()
+    package_ids = ["monthly", "yearly", "invalid_package"]
+    with fixture_cassette("premium_checkout", match_on=CHECKOUT_MATCH_ON):
+        with ThreadPoolExecutor(max_workers=len(package_ids)) as pool:
+            return dict(zip(package_ids, pool.map(create_checkout, package_ids)))
+
+
+@pytest.mark.xdist_group(name="checkout_packages")
+class TestSubscriptionPackages:
+    """Test subscription checkout endpoints"""
+    
+    @pytest.mark.slow
+    @pytest.mark.parametrize("package_id", ["monthly", "yearly"])
+    def test_create_checkout(self, checkout_responses, package_id, ok_json):
+        """Test creating monthly and yearly checkout sessions"""
+        response = checkout_responses[package_id]
+        data = ok_json(response)
         
         assert "checkout_url" in data
         assert "session_id" in data
+        assert data["checkout_url"].startswith("https://")
         
-        print(f"✅ Yearly checkout session created")
+        log.info(f"✅ {package_id.capitalize()} checkout session created")
+        log.info(f"   - session_id: {data['session_id'][:20]}...")
     
-    def test_invalid_package_fails(self, api_client, admin_token):
+    def test_invalid_package_fails(self, checkout_responses):
         """Test that invalid package ID returns error"""
-        response = api_client.post(
-            f"{BASE_URL}/api/subscription/create-checkout",
-            json={
-                "package_id": "invalid_package",
-                "origin_url": "https://vaulton-preview.preview.emergentagent.com",
-                "apply_discount": False
-            },
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
+        response = checkout_responses["invalid_package"]
         assert response.status_code == 422  # Validation error
         
-        print(f"✅ Invalid package correctly rejected")
+        log.info(f"✅ Invalid package correctly rejected")
 
 
 if __name__ == "__main__":
@@ -3,97 +3,76 @@ Stripe Checkout and Dashboard Layout Tests for FinanceHub Application
 Tests: Stripe checkout button, Dashboard layout order, Quote visibility, PRO badge
 """
 import pytest
-import requests
+import contextlib
+import logging
 import os
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://vaulton-preview.preview.emergentagent.com')
 
-# Test credentials
-ADMIN_USERNAME = "admin"
-ADMIN_PASSWORD = "admin"
+# Replay recorded responses from tests/cassettes/<module>/ (pytest-recording)
+pytestmark = pytest.mark.vcr
 
+log = logging.getLogger(__name__)
 
-@pytest.fixture(scope="module")
-def api_client():
-    """Shared requests session"""
-    session = requests.Session()
-    session.headers.update({"Content-Type": "application/json"})
-    return session
+CHECKOUT_URL = f"{BASE_URL}/api/subscription/create-checkout"
+START_TRIAL_URL = f"{BASE_URL}/api/subscription/start-trial"
+ME_URL = f"{BASE_URL}/api/users/me"
+QUOTE_URL = f"{BASE_URL}/api/quote-of-day"
 
-
-@pytest.fixture(scope="module")
-def admin_token(api_client):
-    """Get authentication token for admin user"""
-    response = api_client.post(f"{BASE_URL}/api/users/login", json={
-        "email": ADMIN_USERNAME,
-        "password": ADMIN_PASSWORD
-    })
-    if response.status_code == 200:
-        return response.json().get("access_token")
-    pytest.skip("Admin authentication failed")
-
-
-@pytest.fixture(scope="module")
-def free_user_data(api_client):
-    """Register a new free user for testing"""
-    random_suffix = uuid.uuid4().hex[:8]
-    email = f"freeuser_{random_suffix}@test.com"
-    username = f"freeuser_{random_suffix}"
-    password = "Test123!"
-    
-    response = api_client.post(f"{BASE_URL}/api/users/register", json={
-        "email": email,
-        "username": username,
-        "password": password
-    })
-    if response.status_code == 200:
-        data = response.json()
-        return {
-            "token": data["access_token"],
-            "user_id": data["user_id"],
-            "email": email,
-            "username": username
-        }
-    pytest.skip(f"User registration failed: {response.text}")
+# Create-checkout bodies by package_id; "invalid_package" is the one the backend must reject
+CHECKOUT_PAYLOADS = {
+    package_id: {
+        "package_id": package_id,
+        "origin_url": "https://vaulton-preview.preview.emergentagent.com",
+        "apply_discount": False
+    }
+    for package_id in ("monthly", "yearly", "invalid_package")
+}
+# The checkout calls share a URL and are recorded in whatever order they finish; replay tells
+# them apart by body and, for "noauth" (same body as monthly), by the missing Authorization header
+CHECKOUT_MATCH_ON = ("method", "scheme", "host", "port", "path", "query", "body", "authorized")
 
 
 class TestAdminLogin:
     """Test admin login functionality"""
     
-    def test_admin_login_with_username(self, api_client):
+    @pytest.mark.parametrize("admin_login", ["username"], indirect=True)
+    def test_admin_login_with_username(self, admin_login):
         """Test admin can login with username 'admin' and password 'admin'"""
-        response = api_client.post(f"{BASE_URL}/api/users/login", json={
-            "email": ADMIN_USERNAME,
-            "password": ADMIN_PASSWORD
-        })
-        assert response.status_code == 200, f"Admin login failed: {response.text}"
-        data = response.json()
+        data = admin_login
         assert "access_token" in data
         # Admin login returns is_premium=True (admin has premium access)
         assert data.get("is_premium") == True, "Admin should have premium access"
-        print("✅ Admin login works with username 'admin' and password 'admin'")
+        log.info("✅ Admin login works with username 'admin' and password 'admin'")
+
+
+@pytest.fixture(scope="class")
+def checkout_responses(api_client, free_user_data, fixture_cassette):
+    """free_user_data's create-checkout responses by package_id plus "noauth" (monthly, no token), sent at once"""
+    headers = free_user_data["headers"]
+    calls = {package_id: (payload, headers) for package_id, payload in CHECKOUT_PAYLOADS.items()}
+    calls["noauth"] = (CHECKOUT_PAYLOADS["monthly"], None)
+    
+    def create_checkout(call):
+        payload, call_headers = call
+        return api_client.post(CHECKOUT_URL, json=payload, headers=call_headers)
+    
+    with fixture_cassette("stripe_checkout", match_on=CHECKOUT_MATCH_ON):
+        with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+            return dict(zip(calls, pool.map(create_checkout, calls.values())))
 
 
+@pytest.mark.xdist_group(name="stripe_checkout")
 class TestStripeCheckout:
     """Test Stripe checkout endpoint"""
     
-    def test_create_checkout_monthly(self, api_client, free_user_data):
-        """Test creating a monthly checkout session"""
-        token = free_user_data["token"]
-        
-        response = api_client.post(
-            f"{BASE_URL}/api/subscription/create-checkout",
-            json={
-                "package_id": "monthly",
-                "origin_url": "https://vaulton-preview.preview.emergentagent.com",
-                "apply_discount": False
-            },
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        
-        assert response.status_code == 200, f"Checkout creation failed: {response.text}"
-        data = response.json()
+    @pytest.mark.slow
+    @pytest.mark.parametrize("package_id", ["monthly", "yearly"])
+    def test_create_checkout(self, checkout_responses, package_id, ok_json):
+        """Test creating monthly and yearly checkout sessions"""
+        response = checkout_responses[package_id]
+        data = ok_json(response)
         
         # Verify response structure
         assert "checkout_url" in data, "Missing checkout_url in response"
@@ -103,187 +82,100 @@ class TestStripeCheckout:
         checkout_url = data["checkout_url"]
         assert "stripe.com" in checkout_url or "checkout" in checkout_url, f"Invalid checkout URL: {checkout_url}"
         
-        print(f"✅ Monthly checkout session created successfully")
-        print(f"   - Session ID: {data['session_id'][:20]}...")
-        print(f"   - Checkout URL starts with: {checkout_url[:50]}...")
+        log.info(f"✅ {package_id.capitalize()} checkout session created successfully")
+        log.info(f"   - Session ID: {data['session_id'][:20]}...")
+        log.info(f"   - Checkout URL starts with: {checkout_url[:50]}...")
     
-    def test_create_checkout_yearly(self, api_client, free_user_data):
-        """Test creating a yearly checkout session"""
-        token = free_user_data["token"]
-        
-        response = api_client.post(
-            f"{BASE_URL}/api/subscription/create-checkout",
-            json={
-                "package_id": "yearly",
-                "origin_url": "https://vaulton-preview.preview.emergentagent.com",
-                "apply_discount": False
-            },
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        
-        assert response.status_code == 200, f"Checkout creation failed: {response.text}"
-        data = response.json()
-        
-        assert "checkout_url" in data
-        assert "session_id" in data
-        assert "stripe.com" in data["checkout_url"] or "checkout" in data["checkout_url"]
-        
-        print(f"✅ Yearly checkout session created successfully")
-    
-    def test_checkout_requires_auth(self, api_client):
+    def test_checkout_requires_auth(self, checkout_responses):
         """Test that checkout endpoint requires authentication"""
-        response = api_client.post(
-            f"{BASE_URL}/api/subscription/create-checkout",
-            json={
-                "package_id": "monthly",
-                "origin_url": "https://vaulton-preview.preview.emergentagent.com",
-                "apply_discount": False
-            }
-        )
+        response = checkout_responses["noauth"]
         
         # Should fail without auth token
         assert response.status_code in [401, 403, 422], f"Expected auth error, got: {response.status_code}"
-        print("✅ Checkout endpoint correctly requires authentication")
+        log.info("✅ Checkout endpoint correctly requires authentication")
     
-    def test_checkout_invalid_package(self, api_client, free_user_data):
+    def test_checkout_invalid_package(self, checkout_responses):
         """Test that invalid package ID is rejected"""
-        token = free_user_data["token"]
-        
-        response = api_client.post(
-            f"{BASE_URL}/api/subscription/create-checkout",
-            json={
-                "package_id": "invalid_package",
-                "origin_url": "https://vaulton-preview.preview.emergentagent.com",
-                "apply_discount": False
-            },
-            headers={"Authorization": f"Bearer {token}"}
-        )
+        response = checkout_responses["invalid_package"]
         
         # Should fail with invalid package
         assert response.status_code in [400, 422], f"Expected validation error, got: {response.status_code}"
-        print("✅ Invalid package ID correctly rejected")
+        log.info("✅ Invalid package ID correctly rejected")
 
 
 class TestUserProfile:
     """Test user profile endpoints"""
     
-    def test_free_user_profile(self, api_client, free_user_data):
+    def test_free_user_profile(self, api_client, free_user_data, ok_json):
         """Test that new user starts as free tier"""
-        token = free_user_data["token"]
+        response = api_client.get(ME_URL, headers=free_user_data["headers"])
         
-        response = api_client.get(
-            f"{BASE_URL}/api/users/me",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
+        data = ok_json(response)
         
         # Free user should not be premium
         assert data.get("is_premium") == False or data.get("subscription_level") == "free"
-        print("✅ New user correctly starts as free tier")
+        log.info("✅ New user correctly starts as free tier")
     
-    def test_admin_is_premium(self, api_client, admin_token):
+    def test_admin_is_premium(self, admin_me):
         """Test that admin user has premium access"""
-        response = api_client.get(
-            f"{BASE_URL}/api/users/me",
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
+        data = admin_me
         
         # Admin should have premium access
         assert data.get("is_premium") == True or data.get("role") == "admin"
-        print("✅ Admin user has premium access")
+        log.info("✅ Admin user has premium access")
 
 
 class TestTrialEndpoint:
     """Test trial functionality"""
     
-    def test_start_trial(self, api_client):
-        """Test starting a free trial for new user"""
-        # Register a new user
-        random_suffix = uuid.uuid4().hex[:8]
-        email = f"trialtest_{random_suffix}@test.com"
-        username = f"trialtest_{random_suffix}"
-        password = "Test123!"
-        
-        reg_response = api_client.post(f"{BASE_URL}/api/users/register", json={
-            "email": email,
-            "username": username,
-            "password": password
-        })
-        
-        if reg_response.status_code != 200:
-            pytest.skip(f"User registration failed: {reg_response.text}")
-        
-        token = reg_response.json()["access_token"]
+    def test_trial_lifecycle(self, api_client, fresh_user_token, ok_json):
+        """Test starting a free trial for a new user, and that it cannot be started twice"""
+        headers = {"Authorization": f"Bearer {fresh_user_token}"}
         
         # Start trial
-        response = api_client.post(
-            f"{BASE_URL}/api/subscription/start-trial",
-            headers={"Authorization": f"Bearer {token}"}
-        )
+        response = api_client.post(START_TRIAL_URL, headers=headers)
         
-        assert response.status_code == 200, f"Start trial failed: {response.text}"
-        data = response.json()
+        data = ok_json(response)
         
         assert data.get("status") == "success"
         assert "trial_expires_at" in data
-        print("✅ Free trial started successfully")
-    
-    def test_trial_cannot_start_twice(self, api_client):
-        """Test that trial cannot be started twice"""
-        # Register a new user
-        random_suffix = uuid.uuid4().hex[:8]
-        email = f"trialtwice_{random_suffix}@test.com"
-        username = f"trialtwice_{random_suffix}"
-        password = "Test123!"
-        
-        reg_response = api_client.post(f"{BASE_URL}/api/users/register", json={
-            "email": email,
-            "username": username,
-            "password": password
-        })
-        
-        if reg_response.status_code != 200:
-            pytest.skip(f"User registration failed: {reg_response.text}")
-        
-        token = reg_response.json()["access_token"]
-        
-        # Start trial first time
-        response1 = api_client.post(
-            f"{BASE_URL}/api/subscription/start-trial",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        assert response1.status_code == 200
+        log.info("✅ Free trial started successfully")
         
         # Try to start trial second time
-        response2 = api_client.post(
-            f"{BASE_URL}/api/subscription/start-trial",
-            headers={"Authorization": f"Bearer {token}"}
-        )
+        response = api_client.post(START_TRIAL_URL, headers=headers)
         
         # Should fail
-        assert response2.status_code == 400, f"Expected 400, got: {response2.status_code}"
-        print("✅ Trial correctly cannot be started twice")
+        assert response.status_code == 400, f"Expected 400, got: {response.status_code}"
+        log.info("✅ Trial correctly cannot be started twice")
 
 
 class TestQuoteEndpoint:
     """Test quote of day endpoint"""
     
-    def test_quote_endpoint(self, api_client):
+    def test_quote_endpoint(self, parallel_gets, ok_json):
         """Test that quote endpoint returns a quote"""
-        response = api_client.get(f"{BASE_URL}/api/quote-of-day")
+        response = parallel_gets["/api/quote-of-day"].result()
         
-        assert response.status_code == 200
-        data = response.json()
+        data = ok_json(response)
         
         assert "quote" in data
         assert "author" in data
         assert len(data["quote"]) > 0
-        print(f"✅ Quote endpoint working: \"{data['quote'][:50]}...\" - {data['author']}")
+        log.info(f"✅ Quote endpoint working: \"{data['quote'][:50]}...\" - {data['author']}")
+    
+    def test_quote_conditional_get(self, api_client, parallel_gets):
+        """Test that revalidating with the quote's ETag answers 304 without a body"""
+        first = parallel_gets["/api/quote-of-day"].result()
+        etag = first.headers.get("ETag")
+        assert etag, "quote-of-day should send an ETag"
+        
+        # api_client's response cache would answer a fresh entry locally; this must reach the backend
+        with getattr(api_client, "cache_disabled", contextlib.nullcontext)():
+            response = api_client.get(QUOTE_URL, headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304, f"Expected 304, got: {response.status_code}"
+        assert not response.content
+        log.info("✅ Quote revalidation answered 304")
 
 
 if __name__ == "__main__":
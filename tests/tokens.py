@@ -0,0 +1,16 @@
+"""
+JWT helpers shared by the pytest suite and backend_test.py
+"""
+import base64
+import json
+from typing import Optional
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Read a JWT's exp claim without verifying the signature; None when it has none"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None